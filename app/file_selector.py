@@ -1,19 +1,64 @@
 import os
+import sys
 from PyQt5.QtWidgets import QFileDialog, QApplication, QWidget, QComboBox
-from PyQt5.QtCore import pyqtSignal, QObject
+from PyQt5.QtCore import pyqtSignal, QObject, QRunnable, QThreadPool
 from utils.format_detector import get_supported_target_formats, get_all_supported_source_formats, detect_format, get_file_category
 
+# The supported formats never change while the app runs, so the dialog
+# filter string and the full source -> sorted targets table are built once
+# at import time.
+_ALL_EXTS = tuple(get_all_supported_source_formats())
+_FILTER_STR = "All Supported Files (" + " ".join(f"*.{ext}" for ext in _ALL_EXTS) + ");;All Files (*)"
+_TARGETS = {ext: tuple(sorted(get_supported_target_formats(ext))) for ext in _ALL_EXTS}
+_ALL_EXTS_SET = frozenset(_ALL_EXTS)
+
+def _ext_from_name(path):
+    """Returns the filename extension if it is a supported source format, else None."""
+    ext = os.path.splitext(path)[1].lstrip('.').lower()
+    return ext if ext in _ALL_EXTS_SET else None
+
+# QRunnable can't emit signals itself, so detection reports through this object
+class FormatDetectSignals(QObject):
+    detected = pyqtSignal(str, str) # file path, detected format ("" if unknown)
+
+# Runs detect_format on the global thread pool so slow filesystems don't block the UI
+class FormatDetectRunnable(QRunnable):
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = FormatDetectSignals()
+
+    def run(self):
+        self.signals.detected.emit(self.file_path, detect_format(self.file_path) or "")
+
 class FileSelector(QObject):
     """
     Handles file dialog operations and manages the dropdowns for file formats.
     Emits signals when a file is selected or source format changes.
     """
-    fileSelected = pyqtSignal(str) # Emits the selected file path
-    targetFormatsUpdated = pyqtSignal(list) # Emits a list of supported target formats
+    fileSelected = pyqtSignal(str, str) # Emits the selected file path and its detected format
+    targetFormatsUpdated = pyqtSignal(tuple) # Emits a sorted tuple of supported target formats
+
+    filePicked = pyqtSignal(str) # Emits the chosen path before its format is detected
+    filesPicked = pyqtSignal(list) # Emits the chosen batch paths before their formats are detected
+    filesSelected = pyqtSignal(list, list) # Emits (file path, format) pairs and the skipped unsupported paths
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_source_file = ""
+        self.current_source_files = []
+        self._detect_runnable = None
+        self._batch_formats = {} # Batch path -> detected format, None while still detecting
+        self._batch_runnables = []
+
+    def _dialog_options(self):
+        """Returns the QFileDialog options shared by the single and batch dialogs."""
+        options = QFileDialog.Options() | QFileDialog.ReadOnly
+        if sys.platform != 'win32':
+            # The native dialog stats every file and probes directory icons,
+            # which can freeze the UI for seconds on network-mounted homes.
+            options |= QFileDialog.DontUseNativeDialog | QFileDialog.DontUseCustomDirectoryIcons
+        return options
 
     def open_file_dialog(self):
         """
@@ -21,37 +66,115 @@ class FileSelector(QObject):
         Detects the file format and emits signals for the selected file and
         its supported target formats.
         """
-        options = QFileDialog.Options()
-        # options |= QFileDialog.DontUseNativeDialog # Use this for consistent styling
-        
-        # Filter for all supported source formats
-        all_exts = get_all_supported_source_formats()
-        # Create a filter string like "All Supported Files (*.docx *.pdf ...);;All Files (*)"
-        filter_str_parts = [f"*.{ext}" for ext in all_exts]
-        filter_str = f"All Supported Files ({' '.join(filter_str_parts)})"
-
         file_path, _ = QFileDialog.getOpenFileName(
             None,
             "Select File to Convert",
             "",
-            f"{filter_str};;All Files (*)",
-            options=options
+            _FILTER_STR,
+            options=self._dialog_options()
         )
         
         if file_path:
             self.current_source_file = file_path
-            self.fileSelected.emit(file_path)
-            
-            source_ext = detect_format(file_path)
-            if source_ext:
-                target_formats = get_supported_target_formats(source_ext)
-                self.targetFormatsUpdated.emit(target_formats)
-            else:
-                self.targetFormatsUpdated.emit([]) # No target formats if no extension
+            self.filePicked.emit(file_path)
+
+            ext = _ext_from_name(file_path)
+            if ext:
+                # A supported extension needs no file access, so skip the round trip through the pool
+                self._on_format_detected(file_path, ext)
+                return
+
+            self._detect_runnable = FormatDetectRunnable(file_path)
+            self._detect_runnable.signals.detected.connect(self._on_format_detected)
+            QThreadPool.globalInstance().start(self._detect_runnable)
         else:
             self.current_source_file = ""
-            self.fileSelected.emit("")
-            self.targetFormatsUpdated.emit([])
+            self.fileSelected.emit("", "")
+            self.targetFormatsUpdated.emit(())
+
+    def _on_format_detected(self, file_path, source_ext):
+        """Emits the selection once detection finishes, ignoring results for files no longer selected."""
+        if file_path != self.current_source_file:
+            return
+        self._detect_runnable = None
+        self.fileSelected.emit(file_path, source_ext)
+        if source_ext:
+            self.targetFormatsUpdated.emit(_TARGETS.get(source_ext, ()))
+        else:
+            self.targetFormatsUpdated.emit(()) # No target formats if no extension
+
+    def clear_selection(self):
+        """Forgets the current selection so pending detection results are dropped."""
+        self.current_source_file = ""
+        self.current_source_files = []
+        self._batch_formats = {}
+        self._batch_runnables = []
+
+    def open_files_dialog(self):
+        """
+        Opens a file dialog for the user to select several files at once.
+        Once every file's format is known, emits the supported (path, format)
+        pairs, the files that were skipped as unsupported, and the target
+        formats that all supported files can be converted to.
+        """
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            None,
+            "Select Files to Convert",
+            "",
+            _FILTER_STR,
+            options=self._dialog_options()
+        )
+
+        self.current_source_file = "" # Drop any pending single-file detection
+        self.current_source_files = file_paths
+        self._batch_formats = {file_path: _ext_from_name(file_path) for file_path in file_paths}
+        if file_paths:
+            self.filesPicked.emit(file_paths)
+
+        # Files without a supported extension are detected on the pool
+        self._batch_runnables = []
+        for file_path, source_ext in self._batch_formats.items():
+            if source_ext is None:
+                runnable = FormatDetectRunnable(file_path)
+                runnable.signals.detected.connect(self._on_batch_format_detected)
+                self._batch_runnables.append(runnable)
+        if not self._batch_runnables:
+            self._emit_batch_selection()
+            return
+        for runnable in self._batch_runnables:
+            QThreadPool.globalInstance().start(runnable)
+
+    def _on_batch_format_detected(self, file_path, source_ext):
+        """Records a batch file's format and emits the selection once none are pending."""
+        # Ignore results for files no longer selected or already resolved
+        if self._batch_formats.get(file_path, "") is not None:
+            return
+        self._batch_formats[file_path] = source_ext
+        if None not in self._batch_formats.values():
+            self._batch_runnables = []
+            self._emit_batch_selection()
+
+    def _emit_batch_selection(self):
+        """Emits the supported batch (path, format) pairs, the skipped files, and their common targets."""
+        selected = []
+        skipped = [] # Unknown formats would otherwise empty the common target set
+        for file_path in self.current_source_files:
+            source_ext = self._batch_formats[file_path]
+            if _TARGETS.get(source_ext):
+                selected.append((file_path, source_ext))
+            else:
+                skipped.append(file_path)
+        self.filesSelected.emit(selected, skipped)
+
+        # Only offer targets that are valid for all of the selected files
+        common_formats = None
+        for _, source_ext in selected:
+            target_formats = _TARGETS.get(source_ext, ())
+            if common_formats is None:
+                common_formats = target_formats
+            else:
+                common_formats = tuple(fmt for fmt in common_formats if fmt in target_formats)
+        self.targetFormatsUpdated.emit(common_formats or ())
 
     def update_target_formats_from_source_ext(self, source_extension):
         """
@@ -59,8 +182,7 @@ class FileSelector(QObject):
         (e.g., from a source format dropdown).
         """
         if source_extension:
-            target_formats = get_supported_target_formats(source_extension)
-            self.targetFormatsUpdated.emit(target_formats)
+            self.targetFormatsUpdated.emit(_TARGETS.get(source_extension, ()))
         else:
-            self.targetFormatsUpdated.emit([])
+            self.targetFormatsUpdated.emit(())
 
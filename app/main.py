@@ -1,12 +1,16 @@
 # PyQt5 UI will be inserted here
 import os
+import functools
+import threading
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QLabel, QComboBox, QMessageBox, QProgressDialog
+    QPushButton, QLineEdit, QLabel, QComboBox, QMessageBox, QProgressDialog,
+    QCheckBox
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, QRunnable, QSignalBlocker, QThreadPool, pyqtSignal
 from app.file_selector import FileSelector
 from utils.format_detector import detect_format, get_supported_target_formats, get_all_supported_source_formats
+from utils import conversion_cache
 from converters.document_converter import DocumentConverter
 from converters.spreadsheet_converter import SpreadsheetConverter
 from converters.presentation_converter import PresentationConverter
@@ -14,58 +18,99 @@ from converters.pdf_converter import PdfConverter
 from converters.image_converter import ImageConverter
 from converters.cross_converter import CrossConverter
 
-# Thread for conversion to prevent UI freeze
-class ConversionThread(QThread):
+# Source extensions handled by each converter category
+_DOC_EXTS = frozenset({'doc', 'docx', 'odt', 'rtf', 'txt'})
+_SHEET_EXTS = frozenset({'xls', 'xlsx', 'ods', 'csv'})
+_PPT_EXTS = frozenset({'ppt', 'pptx', 'odp'})
+_PDF_EXTS = frozenset({'pdf'})
+_IMG_EXTS = frozenset({'jpg', 'jpeg', 'png', 'bmp', 'gif', 'tiff', 'tif', 'svg', 'webp', 'ico', 'heic'})
+
+# Maps a source extension to the converter class that handles it
+_CONVERTER_FOR_EXT = (
+    {ext: DocumentConverter for ext in _DOC_EXTS}
+    | {ext: SpreadsheetConverter for ext in _SHEET_EXTS}
+    | {ext: PresentationConverter for ext in _PPT_EXTS}
+    | {ext: PdfConverter for ext in _PDF_EXTS}
+    | {ext: ImageConverter for ext in _IMG_EXTS}
+)
+
+# Sorted once for the source format dropdown
+_SORTED_SOURCE_FORMATS = tuple(sorted(get_all_supported_source_formats()))
+
+# Converter instances are cached per pool thread: batch workers run in
+# parallel and the converters aren't known to be safe to share
+_thread_converters = threading.local()
+
+def _get_converter(converter_cls):
+    """Returns this thread's instance of the converter class, creating it on first use."""
+    instances = getattr(_thread_converters, 'instances', None)
+    if instances is None:
+        instances = _thread_converters.instances = {}
+    if converter_cls not in instances:
+        instances[converter_cls] = converter_cls()
+    return instances[converter_cls]
+
+# QRunnable can't emit signals itself, so workers report through this object
+class ConversionSignals(QObject):
     conversionFinished = pyqtSignal(bool, str) # success, message
-    updateProgress = pyqtSignal(str) # message for progress dialog
+    progressPhase = pyqtSignal(str) # label text, emitted only when the conversion phase changes
+    progressPercent = pyqtSignal(int) # 50 when conversion or the fallback starts
 
-    def __init__(self, input_path, target_extension):
+# Conversion job run on the global thread pool to prevent UI freeze
+class ConversionWorker(QRunnable):
+    def __init__(self, input_path, target_extension, source_ext=None):
         super().__init__()
         self.input_path = input_path
         self.target_extension = target_extension
+        self.source_ext = source_ext # Already-detected format, if the caller has it
+        self.signals = ConversionSignals()
 
     def run(self):
-        self.updateProgress.emit("Starting conversion...")
-        source_ext = detect_format(self.input_path)
+        self.signals.progressPhase.emit("Starting conversion...")
+        source_ext = self.source_ext or detect_format(self.input_path)
         
         if not source_ext:
-            self.conversionFinished.emit(False, "Could not detect source file format.")
+            self.signals.conversionFinished.emit(False, "Could not detect source file format.")
             return
 
         success = False
         output_file = ""
         message = ""
         
+        cross_tried = False # CrossConverter may spawn LibreOffice, so only try it once
+
         try:
             # Determine which converter to use
-            converter = None
-            if source_ext in ['doc', 'docx', 'odt', 'rtf', 'txt']:
-                converter = DocumentConverter()
-            elif source_ext in ['xls', 'xlsx', 'ods', 'csv']:
-                converter = SpreadsheetConverter()
-            elif source_ext in ['ppt', 'pptx', 'odp']:
-                converter = PresentationConverter()
-            elif source_ext == 'pdf':
-                converter = PdfConverter()
-            elif source_ext in ['jpg', 'jpeg', 'png', 'bmp', 'gif', 'tiff', 'tif', 'svg', 'webp', 'ico', 'heic']:
-                converter = ImageConverter()
-
-            if converter:
-                self.updateProgress.emit(f"Converting from .{source_ext} to .{self.target_extension}...")
+            converter_cls = _CONVERTER_FOR_EXT.get(source_ext)
+            converter = _get_converter(converter_cls) if converter_cls else None
+
+            # Identical input converted to the same target before: reuse that output
+            digest = conversion_cache.hash_file(self.input_path)
+            output_file = conversion_cache.restore(digest, self.target_extension, self.input_path)
+            from_cache = bool(output_file)
+            success = from_cache
+
+            if converter and not success:
+                self.signals.progressPercent.emit(50)
+                self.signals.progressPhase.emit(f"Converting from .{source_ext} to .{self.target_extension}...")
                 success, output_file = converter.convert(self.input_path, self.target_extension)
                 if not success and output_file is None: # This means it might need cross-conversion
-                    cross_converter = CrossConverter()
-                    self.updateProgress.emit(f"Attempting cross-category conversion...")
+                    cross_converter = _get_converter(CrossConverter)
+                    self.signals.progressPhase.emit(f"Attempting cross-category conversion...")
+                    cross_tried = True
                     success, output_file = cross_converter.convert(self.input_path, source_ext, self.target_extension)
             
-            if not success:
+            if not success and not cross_tried and not isinstance(converter, CrossConverter):
                 # Fallback to cross-converter if initial specific converter failed or returned None
-                if not isinstance(converter, CrossConverter): # Avoid double-trying if already CrossConverter
-                    cross_converter = CrossConverter()
-                    self.updateProgress.emit(f"Attempting cross-category conversion (fallback)...")
-                    success, output_file = cross_converter.convert(self.input_path, source_ext, self.target_extension)
+                cross_converter = _get_converter(CrossConverter)
+                self.signals.progressPercent.emit(50)
+                self.signals.progressPhase.emit(f"Attempting cross-category conversion (fallback)...")
+                cross_tried = True
+                success, output_file = cross_converter.convert(self.input_path, source_ext, self.target_extension)
 
             if success:
+                if not from_cache:
+                    conversion_cache.store(digest, self.target_extension, self.input_path, output_file)
                 message = f"Conversion successful! Output: {output_file}"
             else:
                 message = "Conversion failed or is not supported."
@@ -75,7 +120,7 @@ class ConversionThread(QThread):
             message = f"An error occurred during conversion: {e}"
             print(f"Conversion error: {e}")
         
-        self.conversionFinished.emit(success, message)
+        self.signals.conversionFinished.emit(success, message)
 
 
 class ConverterUI(QMainWindow):
@@ -85,8 +130,16 @@ class ConverterUI(QMainWindow):
         self.setGeometry(100, 100, 600, 300) # (x, y, width, height)
         
         self.file_selector = FileSelector(self)
-        self.conversion_thread = None # To hold the QThread instance
+        self.conversion_worker = None # To hold the running ConversionWorker
         self.progress_dialog = None
+        self._current_source_ext = None # Format detected for the selected file
+        self.batch_files = [] # Selected (path, format) pairs when converting multiple files
+        self.batch_workers = []
+        self._batch_done = 0
+        self._batch_failures = []
+
+        # Independent files convert in parallel, one per core
+        QThreadPool.globalInstance().setMaxThreadCount(os.cpu_count() or 1)
 
         self._setup_ui()
         self._connect_signals()
@@ -109,6 +162,9 @@ class ConverterUI(QMainWindow):
         input_layout.addWidget(self.browse_button)
         main_layout.addLayout(input_layout)
 
+        self.multi_file_checkbox = QCheckBox("Convert multiple files")
+        main_layout.addWidget(self.multi_file_checkbox)
+
         # Format Selection Section
         format_layout = QHBoxLayout()
         
@@ -145,23 +201,63 @@ class ConverterUI(QMainWindow):
         main_layout.addWidget(self.status_label)
 
     def _connect_signals(self):
-        self.browse_button.clicked.connect(self.file_selector.open_file_dialog)
+        self.browse_button.clicked.connect(self._open_file_dialog)
+        self.multi_file_checkbox.toggled.connect(self._on_multi_file_toggled)
+        self.file_selector.filePicked.connect(self._on_file_picked)
         self.file_selector.fileSelected.connect(self._on_file_selected)
+        self.file_selector.filesPicked.connect(self._on_files_picked)
+        self.file_selector.filesSelected.connect(self._on_files_selected)
         self.file_selector.targetFormatsUpdated.connect(self._on_target_formats_updated)
         self.convert_button.clicked.connect(self._start_conversion)
         self.target_format_combo.currentIndexChanged.connect(self._update_convert_button_state)
 
     def _populate_source_formats(self):
         """Populates the source format combo box with all supported extensions."""
-        all_source_formats = sorted(get_all_supported_source_formats())
-        self.source_format_combo.addItem("Auto-detected") # Default option
-        self.source_format_combo.addItems(all_source_formats)
+        with QSignalBlocker(self.source_format_combo):
+            self.source_format_combo.addItem("Auto-detected") # Default option
+            self.source_format_combo.addItems(_SORTED_SOURCE_FORMATS)
+
+    def _open_file_dialog(self):
+        """Opens the single or multi-file dialog depending on the batch checkbox."""
+        if self.multi_file_checkbox.isChecked():
+            self.file_selector.open_files_dialog()
+        else:
+            self.file_selector.open_file_dialog()
+
+    def _on_multi_file_toggled(self, checked):
+        """Clears the current selection when switching between single and batch mode."""
+        self.file_selector.clear_selection()
+        self._on_file_selected("", "")
+
+    def _on_file_picked(self, file_path):
+        """Shows the chosen path right away while its format is detected in the background."""
+        self._show_pending_selection(file_path, "Detecting file format...")
+
+    def _on_files_picked(self, file_paths):
+        """Shows the chosen batch right away while formats are detected in the background."""
+        text = file_paths[0] if len(file_paths) == 1 else f"{len(file_paths)} files selected"
+        self._show_pending_selection(text, "Detecting file formats...")
 
-    def _on_file_selected(self, file_path):
-        """Updates UI when a file is selected."""
+    def _show_pending_selection(self, text, status):
+        """Drops the previous selection and blocks converting until detection finishes."""
+        self.batch_files = []
+        self._current_source_ext = None
+        self.file_path_input.setText(text)
+        self.source_format_combo.setCurrentIndex(0) # Don't show the previous file's format
+        self.source_format_combo.setEnabled(False)
+        with QSignalBlocker(self.target_format_combo):
+            self.target_format_combo.clear()
+        self.target_format_combo.setEnabled(False)
+        self.convert_button.setEnabled(False) # Wait for the detected format
+        self.status_label.setText(status)
+
+    def _on_file_selected(self, file_path, source_ext):
+        """Updates UI when a file is selected, using the format FileSelector already detected."""
+        self.batch_files = []
         self.file_path_input.setText(file_path)
+        self._current_source_ext = None
         if file_path:
-            source_ext = detect_format(file_path)
+            self._current_source_ext = source_ext or None
             self.source_format_combo.setCurrentText(source_ext if source_ext else "Auto-detected")
             self.source_format_combo.setEnabled(True)
             self.target_format_combo.setEnabled(True)
@@ -176,29 +272,61 @@ class ConverterUI(QMainWindow):
             self.convert_button.setEnabled(False)
             self.status_label.setText("Ready.")
 
+    def _on_files_selected(self, selected, skipped):
+        """Updates UI when several files are selected for batch conversion."""
+        skipped_names = ", ".join(os.path.basename(file_path) for file_path in skipped)
+        if not selected:
+            self._on_file_selected("", "")
+            if skipped:
+                self.status_label.setText(f"No supported files selected: {skipped_names}")
+            return
+
+        self.batch_files = list(selected)
+        if len(selected) == 1:
+            self.file_path_input.setText(selected[0][0])
+        else:
+            self.file_path_input.setText(f"{len(selected)} files selected")
+        # Source formats may differ between files, so there is nothing to show
+        self.source_format_combo.setCurrentIndex(0)
+        self.source_format_combo.setEnabled(False)
+        self._update_convert_button_state()
+        if skipped:
+            self.status_label.setText(f"Skipped unsupported files: {skipped_names}. Choose target format.")
+        else:
+            self.status_label.setText("Files selected. Choose target format.")
+
     def _on_target_formats_updated(self, target_formats):
         """Updates the target format combo box based on the detected source format."""
-        self.target_format_combo.clear()
-        if target_formats:
-            self.target_format_combo.addItems(sorted(target_formats))
-            self.target_format_combo.setPlaceholderText("Select target...")
-            self.target_format_combo.setEnabled(True)
-        else:
-            self.target_format_combo.setPlaceholderText("No supported conversions")
-            self.target_format_combo.setEnabled(False)
+        # Block currentIndexChanged while repopulating; the button state is refreshed once below
+        with QSignalBlocker(self.target_format_combo):
+            self.target_format_combo.clear()
+            if target_formats:
+                self.target_format_combo.addItems(target_formats) # Already sorted by FileSelector
+                self.target_format_combo.setPlaceholderText("Select target...")
+                self.target_format_combo.setEnabled(True)
+            else:
+                self.target_format_combo.setPlaceholderText("No supported conversions")
+                self.target_format_combo.setEnabled(False)
         self._update_convert_button_state()
 
     def _update_convert_button_state(self):
         """Enables/disables the convert button based on selection."""
-        file_selected = bool(self.file_path_input.text())
+        file_selected = bool(self.batch_files) or bool(self.file_path_input.text())
         target_format_selected = self.target_format_combo.currentText() not in ["", "No supported conversions", "Select target..."]
         self.convert_button.setEnabled(file_selected and target_format_selected)
 
     def _start_conversion(self):
         """Initiates the file conversion process in a separate thread."""
-        input_path = self.file_path_input.text()
         target_extension = self.target_format_combo.currentText()
+        if self.batch_files:
+            if not target_extension:
+                QMessageBox.warning(self, "Input Error", "Please select a target format.")
+                return
+            self._start_batch_conversion(self.batch_files, target_extension)
+            return
 
+        # In batch mode the line edit only shows a summary, so it's read for single files only
+        input_path = self.file_path_input.text()
         if not input_path:
             QMessageBox.warning(self, "Input Error", "Please select an input file.")
             return
@@ -210,7 +338,7 @@ class ConverterUI(QMainWindow):
         self.convert_button.setEnabled(False) # Disable convert button during conversion
 
         # Setup progress dialog
-        self.progress_dialog = QProgressDialog("Converting...", "Cancel", 0, 0, self)
+        self.progress_dialog = QProgressDialog("Converting...", "Cancel", 0, 100, self)
         self.progress_dialog.setWindowModality(Qt.WindowModal)
         self.progress_dialog.setMinimumDuration(0)
         self.progress_dialog.setValue(0)
@@ -219,14 +347,15 @@ class ConverterUI(QMainWindow):
         self.progress_dialog.setWindowTitle("Converting File")
         self.progress_dialog.show()
 
-        # Start conversion in a new thread
-        self.conversion_thread = ConversionThread(input_path, target_extension)
-        self.conversion_thread.conversionFinished.connect(self._on_conversion_finished)
-        self.conversion_thread.updateProgress.connect(self.progress_dialog.setLabelText)
-        self.conversion_thread.start()
+        # Run the conversion on a pooled worker thread
+        self.conversion_worker = ConversionWorker(input_path, target_extension, self._current_source_ext)
+        self.conversion_worker.signals.conversionFinished.connect(self._on_conversion_finished)
+        self.conversion_worker.signals.progressPhase.connect(self.progress_dialog.setLabelText)
+        self.conversion_worker.signals.progressPercent.connect(self.progress_dialog.setValue)
+        QThreadPool.globalInstance().start(self.conversion_worker)
 
     def _on_conversion_finished(self, success, message):
-        """Handles the result of the conversion thread."""
+        """Handles the result of the conversion worker."""
         self.convert_button.setEnabled(True) # Re-enable convert button
         self.progress_dialog.close() # Close progress dialog
 
@@ -236,10 +365,60 @@ class ConverterUI(QMainWindow):
         else:
             self.status_label.setText("Conversion Failed.")
             QMessageBox.critical(self, "Conversion Result", message)
-            
-        # Clean up the thread
-        if self.conversion_thread:
-            self.conversion_thread.quit()
-            self.conversion_thread.wait()
-            self.conversion_thread = None
 
+        # The pool owns the worker thread; just drop our reference
+        self.conversion_worker = None
+
+    def _start_batch_conversion(self, batch_files, target_extension):
+        """Converts several files in parallel, one pooled worker per file."""
+        total = len(batch_files)
+        self._batch_done = 0
+        self._batch_failures = []
+
+        self.status_label.setText("Batch conversion in progress...")
+        self.convert_button.setEnabled(False)
+
+        self.progress_dialog = QProgressDialog(f"Converted 0/{total} files...", "Cancel", 0, total, self)
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.setValue(0)
+        self.progress_dialog.setCancelButton(None)
+        self.progress_dialog.setAutoClose(False)
+        self.progress_dialog.setWindowTitle("Converting Files")
+        self.progress_dialog.show()
+
+        pool = QThreadPool.globalInstance()
+        self.batch_workers = []
+        for input_path, source_ext in batch_files:
+            worker = ConversionWorker(input_path, target_extension, source_ext or None)
+            worker.signals.conversionFinished.connect(
+                functools.partial(self._on_batch_item_finished, input_path)
+            )
+            self.batch_workers.append(worker)
+            pool.start(worker)
+
+    def _on_batch_item_finished(self, input_path, success, message):
+        """Counts finished batch items and reports once all of them are done."""
+        total = len(self.batch_workers)
+        self._batch_done += 1
+        if not success:
+            self._batch_failures.append(f"{os.path.basename(input_path)}: {message}")
+
+        self.progress_dialog.setValue(self._batch_done)
+        self.progress_dialog.setLabelText(f"Converted {self._batch_done}/{total} files...")
+        if self._batch_done < total:
+            return
+
+        self.convert_button.setEnabled(True)
+        self.progress_dialog.close()
+        self.batch_workers = []
+
+        if self._batch_failures:
+            self.status_label.setText("Batch Conversion Finished With Errors.")
+            QMessageBox.warning(
+                self, "Conversion Result",
+                f"{len(self._batch_failures)} of {total} conversions failed:\n" + "\n".join(self._batch_failures)
+            )
+        else:
+            self.status_label.setText("Conversion Complete!")
+            QMessageBox.information(self, "Conversion Result", f"All {total} files converted successfully.")
@@ -0,0 +1,159 @@
+# Cache of converted outputs keyed by input content hash and target format
+import os
+import json
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "offline-file-convertor")
+MAX_ENTRIES = 32
+
+_INDEX_PATH = os.path.join(CACHE_DIR, "index.json")
+_CHUNK_SIZE = 1024 * 1024 # 1 MiB
+_lock = threading.Lock() # Batch conversions hit the cache from several workers
+_index = None # OrderedDict of "sha256:target_ext" -> {input, output, cached} paths, oldest first
+
+
+def hash_file(file_path):
+    """Returns the SHA-256 hex digest of a file."""
+    with open(file_path, 'rb', buffering=0) as f:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: uses hashlib's reusable-buffer read loop
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def _is_valid_entry(entry):
+    """True if an index entry has the input, output and cached paths restore() needs."""
+    return isinstance(entry, dict) and all(
+        isinstance(entry.get(field), str) for field in ("input", "output", "cached")
+    )
+
+
+def _load_index():
+    """
+    Loads the JSON sidecar on first use, dropping malformed entries. A missing
+    or unreadable sidecar just means an empty cache. Caller must hold _lock.
+    """
+    global _index
+    if _index is None:
+        index = OrderedDict()
+        try:
+            with open(_INDEX_PATH, 'r', encoding='utf-8') as f:
+                for key, entry in json.load(f):
+                    if isinstance(key, str) and _is_valid_entry(entry):
+                        index[key] = entry
+        except (OSError, ValueError, TypeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Ignoring unreadable conversion cache index: {e}")
+            index = OrderedDict()
+        _index = index
+    return _index
+
+
+def _save_index():
+    """Writes the index back to disk. Caller must hold _lock."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = _INDEX_PATH + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(_index.items()), f)
+        os.replace(tmp_path, _INDEX_PATH)
+    except OSError as e:
+        print(f"Could not save conversion cache index: {e}")
+
+
+def _same_path(a, b):
+    """True if both paths name the same file, including case-insensitive filesystems."""
+    if os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b)):
+        return True
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def restore(digest, target_extension, input_path):
+    """
+    Copies a previously converted output back to the path the converter
+    reported for this same input file.
+    Returns the restored output path, or None on a cache miss. The cache is
+    best-effort, so any failure here is reported as a miss.
+    """
+    try:
+        return _restore(digest, target_extension, input_path)
+    except Exception as e:
+        print(f"Could not restore cached conversion: {e}")
+        return None
+
+
+def _restore(digest, target_extension, input_path):
+    key = f"{digest}:{target_extension}"
+    with _lock:
+        index = _load_index()
+        entry = index.get(key)
+        if entry is None:
+            return None
+        if not os.path.isfile(entry["cached"]):
+            del index[key]
+            _save_index()
+            return None
+        # Same content at another path would have been written elsewhere by the converter
+        if not _same_path(entry["input"], input_path):
+            return None
+        index.move_to_end(key)
+        _save_index()
+
+    cached_file = entry["cached"]
+    output_file = entry["output"]
+    if _same_path(output_file, input_path):
+        return None # Never overwrite the input with a cached copy
+    shutil.copy2(cached_file, output_file)
+    return output_file
+
+
+def store(digest, target_extension, input_path, output_file):
+    """
+    Copies a fresh conversion result into the cache along with the output path
+    the converter reported, evicting the least recently used entry when full.
+    Failures are reported and otherwise ignored; the conversion itself succeeded.
+    """
+    try:
+        _store(digest, target_extension, input_path, output_file)
+    except Exception as e:
+        print(f"Could not cache conversion output: {e}")
+
+
+def _store(digest, target_extension, input_path, output_file):
+    key = f"{digest}:{target_extension}"
+    cached_file = os.path.join(CACHE_DIR, f"{digest}.{target_extension}")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Workers converting identical content write the same cache file, so each
+    # copies to its own temp name and swaps it in atomically
+    tmp_file = f"{cached_file}.{threading.get_ident()}.tmp"
+    try:
+        shutil.copy2(output_file, tmp_file)
+        os.replace(tmp_file, cached_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    with _lock:
+        index = _load_index()
+        index[key] = {
+            "input": os.path.abspath(input_path),
+            "output": os.path.abspath(output_file),
+            "cached": cached_file,
+        }
+        index.move_to_end(key)
+        while len(index) > MAX_ENTRIES:
+            _, evicted = index.popitem(last=False)
+            try:
+                os.remove(evicted["cached"])
+            except OSError:
+                pass
+        _save_index()